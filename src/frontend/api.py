@@ -9,6 +9,8 @@ from langgraph_sdk import get_sync_client
 from langgraph_sdk.schema import Command
 from dotenv import load_dotenv
 from typing import Iterator, Tuple, Literal, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
 
 # Try to import streamlit for secrets (only available in streamlit environment)
@@ -20,50 +22,69 @@ except ImportError:
 
 load_dotenv()
 
-# This can be a local or remote deployment URL, but it must point to a Langgraph Server
-# langgraph_api = "http://localhost:2024"
+# Under Streamlit, cache the client as a shared resource so every session and
+# tab of the same server process reuses one HTTP connection pool (keep-alive
+# instead of a TCP/TLS handshake per call). Outside Streamlit (e.g. the
+# cleanup entry point below) fall back to a plain process-level cache.
+if STREAMLIT_AVAILABLE:
+    _cache_client = st.cache_resource(show_spinner=False)
+else:
+    _cache_client = functools.cache
 
-# Get the API key from environment variables or Streamlit secrets
-langraph_api = None
-api_key = None
-if STREAMLIT_AVAILABLE and hasattr(st, 'secrets'):
-    try:
-        api_key = st.secrets.get("LANGSMITH_API_KEY")
-        langgraph_api = st.secrets.get(
-            "LANGGRAPH_API_URL", "http://localhost:2024")
-    except:
-        pass
-
-if not api_key:
-    api_key = os.getenv("LANGSMITH_API_KEY")
 
-if not api_key:
-    raise ValueError(
-        "LANGSMITH_API_KEY environment variable or Streamlit secret is required for authentication")
-
-# Clean the API key by stripping whitespace
-api_key = api_key.strip()
+@_cache_client
+def _get_client():
+    """
+    Resolve credentials and build the LangGraph client once, on first use.
 
-# Validate the API key format
-if not api_key.startswith("lsv2_"):
-    raise ValueError(
-        f"Invalid API key format. Expected to start with 'lsv2_', got: '{api_key[:10]}...'")
+    Doing this lazily instead of at import time keeps the module import free of
+    side effects, so script reruns or reloads don't redo the key validation and
+    TCP handshake. The cache makes every later call a plain dict lookup.
+    """
+    # This can be a local or remote deployment URL, but it must point to a Langgraph Server
+    langgraph_api = "http://localhost:2024"
+
+    # Get the API key from environment variables or Streamlit secrets
+    api_key = None
+    if STREAMLIT_AVAILABLE and hasattr(st, 'secrets'):
+        try:
+            api_key = st.secrets.get("LANGSMITH_API_KEY")
+            langgraph_api = st.secrets.get(
+                "LANGGRAPH_API_URL", "http://localhost:2024")
+        except:
+            pass
+
+    if not api_key:
+        api_key = os.getenv("LANGSMITH_API_KEY")
+
+    if not api_key:
+        raise ValueError(
+            "LANGSMITH_API_KEY environment variable or Streamlit secret is required for authentication")
+
+    # Clean the API key by stripping whitespace
+    api_key = api_key.strip()
+
+    # Validate the API key format
+    if not api_key.startswith("lsv2_"):
+        raise ValueError(
+            f"Invalid API key format. Expected to start with 'lsv2_', got: '{api_key[:10]}...'")
+
+    # Initialize the client with authentication headers
+    try:
+        return get_sync_client(
+            url=langgraph_api,
+            api_key=api_key  # This adds the x-api-key header automatically
+        )
+    except Exception as e:
+        raise ValueError(f"Failed to initialize LangGraph client: {e}")
 
-# Initialize the client with authentication headers
-try:
-    client = get_sync_client(
-        url=langgraph_api,
-        api_key=api_key  # This adds the x-api-key header automatically
-    )
-except Exception as e:
-    raise ValueError(f"Failed to initialize LangGraph client: {e}")
 
 EventKind = Literal["ai_chunk", "interrupt", "tool", "done", "other"]
 
 
 def get_assistants():
     try:
-        response = client.assistants.search()
+        response = _get_client().assistants.search()
         return response
     except Exception as e:
         raise RuntimeError(f"Failed to get assistants: {e}")
@@ -74,12 +95,12 @@ def create_thread(user_id: str, assistant_name: str | None = None):
     if assistant_name:
         metadata["assistant_name"] = assistant_name
 
-    response = client.threads.create(metadata=metadata)
+    response = _get_client().threads.create(metadata=metadata)
     return response
 
 
 def search_threads(user_id: str):
-    response = client.threads.search(
+    response = _get_client().threads.search(
         metadata={
             "user_id": user_id,
         }
@@ -88,18 +109,21 @@ def search_threads(user_id: str):
 
 
 def delete_thread(thread_id: str):
-    response = client.threads.delete(thread_id)
+    response = _get_client().threads.delete(thread_id)
     return response
 
 
 def delete_all_threads(user_id: str):
     threads = search_threads(user_id)
-    for thread in threads:
-        delete_thread(thread["thread_id"])
+    if not threads:
+        return
+    # Fan out the deletes instead of paying one server round-trip per thread
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(delete_thread, [t["thread_id"] for t in threads]))
 
 
 def get_thread_state(thread_id: str):
-    response = client.threads.get_state(thread_id)
+    response = _get_client().threads.get_state(thread_id)
     return response
 
 
@@ -115,7 +139,7 @@ def run_thread_stream(assistant_id: str, thread_id: str, input: dict[str, Any]):
     Yields:
         str: The processed response from the graph
     """
-    for chunk in client.runs.stream(
+    for chunk in _get_client().runs.stream(
         thread_id=thread_id,
         assistant_id=assistant_id,
         input=input,
@@ -125,22 +149,25 @@ def run_thread_stream(assistant_id: str, thread_id: str, input: dict[str, Any]):
         # We're only interested in the messages event
         # You can add additional logic to handle other events such as metadata
         # Note that the payload of the chunk depends on the stream_mode
-        if chunk.event == "messages":
-            # yield chunk
-
-            # We only want to yield AI messages
-            # If you want to see the raw chunks, uncomment the `yield chunk` line above
-            if chunk.data[0]["type"] == "AIMessageChunk":
-                # If the AI message contains tool calls, we want to yield the tool call name and arguments
-                if chunk.data[0]["tool_call_chunks"]:
-                    tool_chunk = chunk.data[0]["tool_call_chunks"][0]
-                    if tool_chunk["name"]:
-                        yield tool_chunk["name"]
-                    else:
-                        yield tool_chunk["args"]
-                # If the AI message does not contain tool calls, we want to yield the content
-                else:
-                    yield chunk.data[0]["content"]
+        if chunk.event != "messages":
+            continue
+
+        # Bind the message once; this loop runs per streamed token, so the
+        # repeated chunk.data[0][...] subscripts add up
+        message = chunk.data[0]
+
+        # We only want to yield AI messages
+        if message["type"] != "AIMessageChunk":
+            continue
+
+        tool_call_chunks = message.get("tool_call_chunks")
+        if tool_call_chunks:
+            # If the AI message contains tool calls, we want to yield the tool call name and arguments
+            tool_chunk = tool_call_chunks[0]
+            yield tool_chunk["name"] or tool_chunk["args"]
+        else:
+            # If the AI message does not contain tool calls, we want to yield the content
+            yield message["content"]
 
 
 def run_thread_events(
@@ -159,7 +186,7 @@ def run_thread_events(
         kwargs["input"] = initial_input or {}
 
     try:
-        for chunk in client.runs.stream(**kwargs):
+        for chunk in _get_client().runs.stream(**kwargs):
             if chunk.event != "updates":
                 yield ("other", {"event": chunk.event, "data": chunk.data})
                 continue
@@ -191,7 +218,7 @@ def run_thread_events(
         yield ("other", {"error": str(e)})
 
 
-async def main():
+def main():
     """
     Convenience function to cleanup all threads for a user. You can use this to manage your Langgraph Server environment while you're testing and developing.
     """
@@ -201,8 +228,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
-    import nest_asyncio
-    nest_asyncio.apply()
-
-    asyncio.run(main())
+    main()
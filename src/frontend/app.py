@@ -5,7 +5,6 @@ This is a basic chat app/UI for interacting with Langgraph Agents via the Langgr
 
 This is a great starting point for learning how to build a full-stack AI application.
 """
-import json
 import streamlit as st
 from pathlib import Path
 from api import (
@@ -16,6 +15,13 @@ from utils import render_initial_message
 from sidebar import render_sidebar
 from state import initialize_session_state
 
+# Use orjson for parsing tool results when it's installed (noticeably faster
+# than stdlib json); fall back to the stdlib otherwise
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 initialize_session_state(user_id="valdrin")
 
@@ -66,6 +72,7 @@ def handle_resume_if_needed():
                 pass
 
     # After finishing resume streaming, rerun to refresh thread state & normal UI
+    st.session_state.thread_state_version += 1
     st.rerun()
 
 
@@ -353,7 +360,7 @@ display_assistant = st.session_state.active_assistant
 
 # Load latest thread state FIRST before rendering anything
 if (st.session_state.selected_thread_id and
-        st.session_state.selected_thread_id in st.session_state.thread_ids):
+        st.session_state.selected_thread_id in st.session_state.thread_ids_set):
     st.session_state.thread_state = get_thread_state(
         st.session_state.selected_thread_id)
 else:
@@ -407,6 +414,7 @@ if (st.session_state.selected_thread_id and
                     st.session_state.pending_interrupt = data
                     st.session_state.pending_payload = val
                     break
+        st.session_state.thread_state_version += 1
         st.rerun()
 
 if ts := st.session_state.thread_state:
@@ -423,7 +431,7 @@ if ts := st.session_state.thread_state:
         if message.get("type") == "tool":
             with st.expander(f"🛠️ {message.get('name', 'tool')} < RESULTS > "):
                 try:
-                    json_message = json.loads(message.get("content") or "{}")
+                    json_message = json_loads(message.get("content") or "{}")
                     st.json(json_message)
                 except Exception:
                     st.write(message.get("content") or "")
@@ -523,4 +531,5 @@ if prompt and not interrupt_active and not has_question_enabled_interrupt:
         if not received_content and not buffer:
             placeholder.markdown("_Thinking..._")
 
+    st.session_state.thread_state_version += 1
     st.rerun()
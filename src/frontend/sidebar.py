@@ -1,33 +1,45 @@
 import streamlit as st
 from api import get_thread_state, create_thread, delete_thread
+from utils import ingest_thread
 
+# Session keys cleared whenever the active thread context changes
+# (assistant switch, thread create, thread delete)
+_PENDING_RESET = {
+    "pending_interrupt": None,
+    "pending_payload": None,
+    "is_resuming": False,
+    "resume_payload": None,
+}
 
-def render_sidebar():
-    keys = list(st.session_state.assistants.keys())
-    # API mapping should be first
-    if "API mapping" in keys:
-        keys.remove("API mapping")
-        options = ["API mapping"] + sorted(keys)
-    else:
-        options = sorted(keys)
-    assistant = st.selectbox("Select Mode", options)
 
-    previous_assistant = st.session_state.get("active_assistant")
-    assistant_changed = previous_assistant is not None and previous_assistant != assistant
+def _reset_pending():
+    st.session_state.update(_PENDING_RESET)
 
-    st.session_state.active_assistant = assistant
 
-    st.session_state.active_assistant_id = st.session_state.assistants.get(
-        assistant)
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def _cached_thread_state(thread_id: str, version: int):
+    """
+    Cacheable wrapper around get_thread_state.
 
-    if assistant_changed:
-        st.session_state.thread_state = {}
-        st.session_state.selected_thread_id = None
-        # Clear any pending interrupts when switching assistants
-        st.session_state.pending_interrupt = None
-        st.session_state.pending_payload = None
-        st.session_state.is_resuming = False
-        st.session_state.resume_payload = None
+    version is a session counter that gets bumped whenever a run completes or
+    a thread is deleted, so re-selecting an unchanged thread is served from
+    the in-process cache instead of a backend round-trip.
+    """
+    return get_thread_state(thread_id)
+
+
+def render_sidebar():
+    assistant = st.selectbox("Select Mode", st.session_state.assistant_options)
+
+    previous_assistant = st.session_state.get("active_assistant")
+    if assistant != previous_assistant:
+        st.session_state.active_assistant = assistant
+        st.session_state.active_assistant_id = st.session_state.assistants.get(
+            assistant)
+        if previous_assistant is not None:
+            # Drop the thread selection and any pending interrupts when switching assistants
+            st.session_state.update(
+                {**_PENDING_RESET, "thread_state": {}, "selected_thread_id": None})
 
     st.title("Conversations")
     st.caption("A TCM chatbot to assist with API mapping.")
@@ -37,77 +49,70 @@ def render_sidebar():
 
     if st.session_state.thread_ids:
         def _on_select_thread():
-            st.session_state.thread_state = get_thread_state(
-                st.session_state.selected_thread_id)
-
-        # Ensure selected thread exists
-        if (
-            "selected_thread_id" not in st.session_state
-            or st.session_state.selected_thread_id not in st.session_state.thread_ids
-        ):
+            st.session_state.thread_state = _cached_thread_state(
+                st.session_state.selected_thread_id,
+                st.session_state.thread_state_version)
+
+        # Only render the most recent page of conversations; the radio's
+        # format_func runs for every option on every rerun, so an unbounded
+        # list makes the sidebar sluggish for heavy users
+        visible_thread_ids = st.session_state.thread_ids[
+            :st.session_state.visible_thread_limit]
+
+        # Ensure selected thread exists (the key itself is guaranteed by
+        # initialize_session_state)
+        if st.session_state.selected_thread_id not in st.session_state.thread_ids_set:
             # Use first thread (oldest) if current selection is invalid
-            st.session_state.selected_thread_id = st.session_state.thread_ids[0]
+            st.session_state.selected_thread_id = visible_thread_ids[0]
+
+        # Prebind the labels for the visible page; dict.__getitem__ is a
+        # C-level callable, so the per-option format_func calls skip a Python
+        # function frame each
+        threads_by_id = st.session_state.threads_by_id
+        labels = {}
+        for tid in visible_thread_ids:
+            thread = threads_by_id.get(tid)
+            labels[tid] = thread["_display_label"] if thread else tid[:8]
 
         st.radio(
             "Select Conversation",
-            options=st.session_state.thread_ids,
-            format_func=format_thread_name,
+            options=visible_thread_ids,
+            format_func=labels.__getitem__,
             key="selected_thread_id",
             on_change=_on_select_thread,
         )
 
+        if len(st.session_state.thread_ids) > st.session_state.visible_thread_limit:
+            st.button("Show older conversations", on_click=_show_older_threads)
+
     if st.button("Delete Conversation", type="primary"):
         if st.session_state.selected_thread_id:
             _delete_thread_and_update_state(
                 st.session_state.selected_thread_id)
 
 
-def format_thread_name(thread_id: str) -> str:
-    """Format thread name for display in conversation selector."""
-    thread = next(
-        (t for t in st.session_state.threads if t["thread_id"] == thread_id), None)
-
-    if thread:
-        if "created_at" in thread:
-            try:
-                import datetime
-                if isinstance(thread["created_at"], str):
-                    dt = datetime.datetime.fromisoformat(
-                        thread["created_at"].replace("Z", "+00:00"))
-                else:
-                    dt = datetime.datetime.fromtimestamp(thread["created_at"])
-                date_str = dt.strftime("%Y-%m-%d %H:%M")
-                return f"{date_str} ({thread_id[:8]})"
-            except (ValueError, TypeError, KeyError):
-                pass
-
-        if "metadata" in thread and thread["metadata"]:
-            metadata = thread["metadata"]
-            if "title" in metadata:
-                return f"{metadata['title']} ({thread_id[:8]})"
-            if "name" in metadata:
-                return f"{metadata['name']} ({thread_id[:8]})"
-
-    return thread_id[:8]
+def _show_older_threads():
+    st.session_state.visible_thread_limit += 25
 
 
 def _create_new_thread(user_id: str):
     # Create thread with the current assistant name stored in metadata
     thread = create_thread(user_id, st.session_state.active_assistant)
+    ingest_thread(thread)
     # Insert at the beginning of the list (index 0) instead of appending
     st.session_state.threads.insert(0, thread)
     st.session_state.thread_ids.insert(0, thread["thread_id"])
+    st.session_state.thread_ids_set.add(thread["thread_id"])
+    st.session_state.threads_by_id[thread["thread_id"]] = thread
     st.session_state.selected_thread_id = thread["thread_id"]
 
     # Clear any pending interrupts when creating new thread
-    st.session_state.pending_interrupt = None
-    st.session_state.pending_payload = None
-    st.session_state.is_resuming = False
-    st.session_state.resume_payload = None
+    _reset_pending()
     st.session_state.initial_run_triggered = False
 
-    # Get the thread state - for a new thread this will be empty
-    st.session_state.thread_state = get_thread_state(thread["thread_id"])
+    # A freshly created thread has no state yet, so skip the backend fetch
+    # and seed the known-empty shape directly
+    st.session_state.thread_state = {"values": {"messages": []}}
 
     # Mark that we need to initialize this thread on next interaction
     st.session_state.thread_needs_init = True
@@ -117,16 +122,19 @@ def _create_new_thread(user_id: str):
 
 def _delete_thread_and_update_state(thread_id: str):
     delete_thread(thread_id)
-    if thread_id in st.session_state.thread_ids:
-        st.session_state.thread_ids.remove(thread_id)
-    st.session_state.threads = [
-        t for t in st.session_state.threads if t["thread_id"] != thread_id]
+    # Invalidate cached thread states so a reused thread id can't serve stale data
+    st.session_state.thread_state_version += 1
+    thread = st.session_state.threads_by_id.pop(thread_id, None)
+    if thread is not None:
+        # Remove the dict we already hold instead of rebuilding the list
+        # with a second comparison pass over every thread
+        st.session_state.threads.remove(thread)
+    st.session_state.thread_ids_set.discard(thread_id)
+    st.session_state.thread_ids = [
+        tid for tid in st.session_state.thread_ids if tid != thread_id]
     st.session_state.thread_state = {}
     # Clear any pending interrupts when deleting thread
-    st.session_state.pending_interrupt = None
-    st.session_state.pending_payload = None
-    st.session_state.is_resuming = False
-    st.session_state.resume_payload = None
+    _reset_pending()
     # If we deleted the selected thread, pick a new one
     if st.session_state.thread_ids:
         # Select the first remaining thread
@@ -1,5 +1,25 @@
 import streamlit as st
 from api import get_assistants, search_threads
+from utils import ingest_thread
+
+# Per-session defaults that need no computation, applied in one pass so the
+# rest of the app can assume the keys exist
+_SESSION_DEFAULTS = {
+    "thread_state": {},
+    "pending_interrupt": None,
+    "pending_payload": None,
+    "is_resuming": False,
+    "resume_payload": None,
+    # Generic rerun trigger for callbacks (avoid calling st.rerun() inside them)
+    "trigger_rerun": False,
+    # Flag to track if a thread needs initialization
+    "thread_needs_init": False,
+    # Version token for the cached thread-state lookups; bumped whenever a run
+    # completes or a thread is deleted so the cache invalidates
+    "thread_state_version": 0,
+    # How many conversations the sidebar renders; grown by "Show older"
+    "visible_thread_limit": 25,
+}
 
 
 def initialize_session_state(user_id: str):
@@ -7,6 +27,9 @@ def initialize_session_state(user_id: str):
     Initialize the session state with the user ID and other data we need to manage the chat app.
     """
 
+    for key, value in _SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+
     if "user_id" not in st.session_state:
         st.session_state.user_id = user_id
 
@@ -15,6 +38,15 @@ def initialize_session_state(user_id: str):
         st.session_state.assistants = {
             a["name"]: a["assistant_id"] for a in assistants_list
         }
+        # Build the mode-selector options once; assistants don't change within
+        # a session, so re-sorting them on every rerun is wasted work.
+        # API mapping should be first
+        names = list(st.session_state.assistants.keys())
+        if "API mapping" in names:
+            names.remove("API mapping")
+            st.session_state.assistant_options = ["API mapping"] + sorted(names)
+        else:
+            st.session_state.assistant_options = sorted(names)
 
     if "active_assistant_id" not in st.session_state:
         assistant_ids = list(st.session_state.assistants.values())
@@ -27,10 +59,18 @@ def initialize_session_state(user_id: str):
     if "threads" not in st.session_state:
         st.session_state.threads = []
         threads = search_threads(st.session_state.user_id)
+        for thread in threads:
+            ingest_thread(thread)
         st.session_state.threads = threads
         # Keep backward compatibility with thread_ids
         st.session_state.thread_ids = [
             thread["thread_id"] for thread in threads]
+        # Index threads by id; the list keeps the ordering, the dict gives
+        # O(1) lookups instead of scanning the list on every rerender
+        st.session_state.threads_by_id = {
+            thread["thread_id"]: thread for thread in threads}
+        # Set sidecar for O(1) membership checks; the list stays for ordering
+        st.session_state.thread_ids_set = set(st.session_state.thread_ids)
 
     if "selected_thread_id" not in st.session_state:
         if st.session_state.thread_ids:
@@ -39,23 +79,3 @@ def initialize_session_state(user_id: str):
         else:
             st.session_state.selected_thread_id = None
 
-    if "thread_state" not in st.session_state:
-        st.session_state.thread_state = {}
-
-    if "pending_interrupt" not in st.session_state:
-        st.session_state.pending_interrupt = None
-    if "pending_payload" not in st.session_state:
-        st.session_state.pending_payload = None
-
-    if "is_resuming" not in st.session_state:
-        st.session_state.is_resuming = False
-    if "resume_payload" not in st.session_state:
-        st.session_state.resume_payload = None
-
-    # Generic rerun trigger for callbacks (avoid calling st.rerun() inside them)
-    if "trigger_rerun" not in st.session_state:
-        st.session_state.trigger_rerun = False
-
-    # Flag to track if a thread needs initialization
-    if "thread_needs_init" not in st.session_state:
-        st.session_state.thread_needs_init = False
@@ -1,5 +1,71 @@
+import datetime
+
 import streamlit as st
 
+# Greeting shown for a fresh thread, keyed by assistant name. Built once at
+# import time so reruns do an O(1) lookup instead of re-joining the strings.
+_GREETINGS = {
+    "API mapping": (
+        "Welcome to the **API Mapping Assistant**. This assistant guides you step by step through all the relevant steps required to technically connect your partner or host system to Compliance Screening via an API.\n\n"
+        "Additionally you can ask me general questions about the integration or the API during each step."
+    ),
+    # "API questions and answers": (
+    #     "Hello! I am your **AEB API Mapping Assistant**. "
+    #     "You can ask me general questions about the Screening API."
+    # ),
+    # "API error analysis": (
+    #     "Hello! I am your **AEB API Mapping Assistant**. "
+    #     "I help you explain errors when using the Screening API."
+    # ),
+}
+
+
+def ingest_thread(thread: dict) -> dict:
+    """
+    Normalize a thread dict received from the backend for UI use.
+
+    Parses created_at and builds the display label once, so rerenders read
+    precomputed values instead of redoing the timestamp parse and string
+    building per thread per rerun.
+    """
+    created_at = thread.get("created_at")
+    created_dt = None
+    if created_at is not None:
+        try:
+            if isinstance(created_at, str):
+                created_dt = datetime.datetime.fromisoformat(
+                    created_at.replace("Z", "+00:00"))
+            else:
+                created_dt = datetime.datetime.fromtimestamp(created_at)
+        except (ValueError, TypeError):
+            created_dt = None
+    thread["_created_dt"] = created_dt
+    thread["_display_label"] = compute_thread_label(thread)
+    return thread
+
+
+def compute_thread_label(thread: dict) -> str:
+    """
+    Build the display label for a thread once, at ingest time.
+
+    Streamlit calls the conversation radio's format_func for every thread on
+    every rerun; precomputing the label when a thread is loaded or created
+    keeps the timestamp parsing and string building off that hot path.
+    """
+    thread_id = thread["thread_id"]
+
+    created_dt = thread.get("_created_dt")
+    if created_dt is not None:
+        date_str = created_dt.strftime("%Y-%m-%d %H:%M")
+        return f"{date_str} ({thread_id[:8]})"
+
+    metadata = thread.get("metadata") or {}
+    title = metadata.get("title") or metadata.get("name")
+    if title:
+        return f"{title} ({thread_id[:8]})"
+
+    return thread_id[:8]
+
 
 def render_initial_message(agent_name: str | None, thread_state: dict | None) -> None:
     """
@@ -27,44 +93,26 @@ def render_initial_message(agent_name: str | None, thread_state: dict | None) ->
         if metadata and "assistant_name" in metadata:
             actual_agent_name = metadata["assistant_name"]
 
-    # Check if there are already messages in the thread
+    # Check if there are already messages in the thread. Only the first
+    # message matters here, so stop at the first values entry that carries
+    # messages instead of walking the whole payload
     messages = []
     if "values" in thread_state and isinstance(thread_state["values"], dict):
-        messages = thread_state["values"].get("messages", [])
+        messages = thread_state["values"].get("messages") or []
     elif "values" in thread_state and isinstance(thread_state["values"], list):
-        for item in thread_state["values"]:
-            if isinstance(item, dict) and "messages" in item:
-                messages = item["messages"]
-                break
-
-    # Only show initial message if thread is empty OR if the first message is from the user
-    # (meaning our greeting wasn't saved to the backend)
-    should_show_greeting = False
-    if not messages:
-        # Empty thread - show greeting
-        should_show_greeting = True
-    elif messages and messages[0].get("type") != "ai":
-        # First message is not from AI - show greeting before it
-        should_show_greeting = True
-
-    if not should_show_greeting:
+        messages = next(
+            (item["messages"] for item in thread_state["values"]
+             if isinstance(item, dict) and "messages" in item),
+            [],
+        )
+
+    # Only show initial message if thread is empty OR if the first message is
+    # from the user (meaning our greeting wasn't saved to the backend)
+    first_message = messages[0] if messages else None
+    if first_message is not None and first_message.get("type") == "ai":
         return
 
-    match (actual_agent_name):
-        case "API mapping":
-            with st.chat_message("assistant"):
-                st.markdown("Welcome to the **API Mapping Assistant**. This assistant guides you step by step through all the relevant steps required to technically connect your partner or host system to Compliance Screening via an API.\n\n"
-                            "Additionally you can ask me general questions about the integration or the API during each step."
-                            )
-        # case "API questions and answers":
-        #     with st.chat_message("assistant"):
-        #         st.markdown("Hello! I am your **AEB API Mapping Assistant**. "
-        #                     "You can ask me general questions about the Screening API."
-        #                     )
-        # case "API error analysis":
-        #     with st.chat_message("assistant"):
-        #         st.markdown("Hello! I am your **AEB API Mapping Assistant**. "
-        #                     "I help you explain errors when using the Screening API."
-        #                     )
-        case _:
-            ...
+    greeting = _GREETINGS.get(actual_agent_name)
+    if greeting:
+        with st.chat_message("assistant"):
+            st.markdown(greeting)